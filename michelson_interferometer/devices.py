@@ -7,17 +7,31 @@
 ### Imports ###
 ###############
 
-from glob import glob
-from itertools import cycle
-from os import environ
-from queue import Empty, Queue
-from threading import Lock
-from time import sleep
+import sys
+from collections import deque
+from contextlib import nullcontext
+from fnmatch import fnmatch
+from functools import lru_cache
+from os import environ, scandir
+from queue import Empty
+from threading import Event, Lock
+from time import monotonic, sleep
 from time import time as unix_time
-from traceback import print_exc
+from traceback import print_exception
 from typing import TYPE_CHECKING, Any, Callable
 from warnings import catch_warnings
 
+# Fake devices for testing. Pre-seeding sys.modules with the mock
+# module short-circuits the pylablib imports below, so the real library
+# (which loads every device binding at import time) is never imported
+# at all.
+fake_devices = (not TYPE_CHECKING) and ("MI_FAKE_DEVICES" in environ)
+if fake_devices:
+    from . import devices_mock
+
+    sys.modules["pylablib.core.devio.SCPI"] = devices_mock
+    sys.modules["pylablib.devices.Thorlabs"] = devices_mock
+
 with catch_warnings(category=UserWarning, action="ignore", lineno=15):
     from pylablib.core.devio.SCPI import SCPIDevice
     from pylablib.devices.Thorlabs import KinesisMotor, ThorlabsError
@@ -37,12 +51,25 @@ MOTOR_SCALE = (2_000.0, 13_421.77, 1.374)
 MOTOR_MAX_POS = 50.0  # millimeters
 MOTOR_MAX_SPEED = 100.0  # millimeters/second
 INVALID_SPEED = -1.0  # millimeters/second
+INVALID_POSITION = -1.0  # millimeters
 
 DETECTOR_BAUD = 115_200
-DETECTOR_TIMEOUT = 0.05  # seconds
+DETECTOR_TIMEOUT = 0.002  # seconds; the polling fast path
+DETECTOR_SLOW_TIMEOUT = 1.0  # seconds; identification and gain changes
 DETECTOR_NL = "\n"
+GAIN_POLL_ATTEMPTS = 20
+GAIN_POLL_INTERVAL = 0.005  # seconds
 
 SLEEP_DURATION = 1 / 120  # seconds
+SPIN_DURATION = 0.001  # seconds
+RETRY_INITIAL_WAIT = 0.002  # seconds
+
+# The GUI can't usefully render updates faster than this, so the
+# on_update callbacks only fire every few samples.
+GUI_UPDATE_RATE = 60  # Hz
+GUI_UPDATE_DIVISOR = round(1 / SLEEP_DURATION / GUI_UPDATE_RATE)
+
+EXCEPTION_REPORT_INTERVAL = 1.0  # seconds
 
 MAX_INTENSITY = 2**16 - 1  # 16-bit detector
 
@@ -51,16 +78,86 @@ MAX_INTENSITY = 2**16 - 1  # 16-bit detector
 ### Initialization ###
 ######################
 
-# Fake devices for testing
-if (not TYPE_CHECKING) and ("MI_FAKE_DEVICES" in environ):
-    from .devices_mock import KinesisMotor, SCPIDevice
-
+if fake_devices:
     MOTOR_DEVICE_GLOB = "/dev/null"
     DETECTOR_DEVICE_GLOB = "/dev/null"
 
-    fake_devices = True
-else:
-    fake_devices = False
+
+############################
+### Function Definitions ###
+############################
+
+
+@lru_cache(maxsize=None)
+def resolve_device(pattern: str) -> str:
+    """Finds the device path matching the given glob pattern.
+
+    Cached so that re-instantiating a device doesn't re-scan /dev, and
+    cheaper than glob() since it lists the directory exactly once
+    without compiling any regexes.
+    """
+    directory, _, name_pattern = pattern.rpartition("/")
+    for entry in scandir(directory):
+        if fnmatch(entry.name, name_pattern):
+            return entry.path
+
+    raise IOError(f"No device found matching {pattern!r}")
+
+
+def wait_for_tick(deadline: float) -> float:
+    """Waits until the given time.monotonic deadline, then returns the
+    deadline for the next tick.
+
+    time.sleep is only accurate to the OS scheduler quantum, and the
+    device round-trip times vary per query, so sleeping a fixed duration
+    per tick produces non-uniform sample timestamps — bad for the
+    Lomb-Scargle post-processing. Instead, we sleep coarsely until just
+    before the deadline, then spin for the final millisecond. If we've
+    overrun by more than a full tick, we drop the missed ticks instead
+    of trying to catch up.
+    """
+    while monotonic() < deadline - SPIN_DURATION:
+        sleep(SPIN_DURATION / 2)
+    while monotonic() < deadline:
+        pass
+
+    next_deadline = deadline + SLEEP_DURATION
+    if monotonic() > next_deadline:
+        next_deadline = monotonic() + SLEEP_DURATION
+    return next_deadline
+
+
+def tune_serial_port(device: Any) -> None:
+    """Tunes a device's serial port for low-latency polling.
+
+    All of this is best-effort: mock devices and non-USB serial ports
+    don't support these knobs, and the application still works (albeit
+    slower) without them.
+    """
+    try:
+        # pylablib wraps the underlying pyserial object as
+        # device.instr.instr
+        conn = device.instr.instr
+    except AttributeError:
+        return
+
+    # FTDI and many other USB-serial drivers buffer received bytes for
+    # up to 16ms before passing them to userspace, which would cap our
+    # polling rate well below the target of 1/SLEEP_DURATION Hz.
+    # set_low_latency_mode issues the TIOCSSERIAL/ASYNC_LOW_LATENCY
+    # ioctl on Linux.
+    try:
+        conn.set_low_latency_mode(True)
+    except Exception:
+        pass
+
+    # Make sure that small command writes are sent immediately instead
+    # of being combined or timed out by the driver.
+    try:
+        conn.write_timeout = 0
+        conn.inter_byte_timeout = None
+    except Exception:
+        pass
 
 
 #########################
@@ -68,39 +165,149 @@ else:
 #########################
 
 
+class ExceptionReporter:
+    """Collects exceptions from the polling hot loops and prints them
+    from a separate thread, at most once per report interval.
+
+    traceback formatting writes to stderr synchronously, so on a
+    misbehaving device an exception per tick would make the error
+    reporting itself starve the polling loop. The loops just store the
+    exception and bump a count here instead.
+    """
+
+    def __init__(self) -> None:
+        self._last_exc: Exception | None = None
+        self._count = 0
+        utils.start_thread(self._run_thread)
+
+    def record(self, exc: Exception) -> None:
+        """Stores an exception for later reporting."""
+        self._last_exc = exc
+        self._count += 1
+
+    def _run_thread(self) -> None:
+        while True:
+            sleep(EXCEPTION_REPORT_INTERVAL)
+
+            exc, count = self._last_exc, self._count
+            if exc is None:
+                continue
+            self._last_exc = None
+            self._count = 0
+
+            print(
+                f"{count} device error(s) since the last report;",
+                "most recent:",
+                file=sys.stderr,
+            )
+            print_exception(exc)
+
+
+# Shared by every device polling thread
+_exception_reporter = ExceptionReporter()
+
+
+# Sentinels for the CommandQueue bookkeeping
+_LATEST = object()  # a coalesced command; look its argument up on pop
+_MISSING = object()  # a coalesced argument that was already consumed
+
+
+class CommandQueue:
+    """A queue of device commands.
+
+    One-shot commands like "home" or "stop" are queued in FIFO order,
+    but "latest-wins" commands like "move to a position" supersede any
+    queued-but-unexecuted command of the same kind. This way, dragging
+    the position slider doesn't pile up dozens of stale targets that the
+    motor would execute (and immediately supersede) one tick at a time.
+
+    The queue has exactly one producer (the GUI thread) and one consumer
+    (the device thread), so it can be lock-free: deque.append and
+    deque.popleft are atomic under the GIL, and the coalesced arguments
+    live in a dict that only ever holds the newest value. A command may
+    occasionally be enqueued twice during a race, but the duplicate is
+    detected and skipped on pop, and no command is ever lost.
+    """
+
+    def __init__(self) -> None:
+        self._commands: deque[tuple[Callable[[Any], None], Any]] = deque()
+        self._latest: dict[Callable[[Any], None], Any] = {}
+        self._pending: dict[Callable[[Any], None], bool] = {}
+
+        # Set whenever a command is enqueued, so that the consumer can
+        # sleep on it instead of only checking once per tick.
+        self.wake = Event()
+
+    def put(self, func: Callable[[Any], None], arg: Any = None) -> None:
+        """Appends a one-shot command to the queue."""
+        self._commands.append((func, arg))
+        self.wake.set()
+
+    def replace(self, func: Callable[[Any], None], arg: Any = None) -> None:
+        """Appends a command, superseding any queued command of the same
+        kind."""
+        self._latest[func] = arg
+        if func not in self._pending:
+            self._pending[func] = True
+            self._commands.append((func, _LATEST))
+        self.wake.set()
+
+    def get_nowait(self) -> tuple[Callable[[Any], None], Any]:
+        """Pops the oldest command, raising Empty if there are none."""
+        while True:
+            try:
+                func, arg = self._commands.popleft()
+            except IndexError:
+                raise Empty from None
+
+            if arg is _LATEST:
+                self._pending.pop(func, None)
+                arg = self._latest.pop(func, _MISSING)
+                if arg is _MISSING:
+                    # Duplicate entry; a newer value was already popped
+                    continue
+            return func, arg
+
+
 class Motor:
     """Controls the motor that moves the mirror."""
 
     def __init__(self, on_update: Callable[[float], Any]) -> None:
         # Initialize the device
-        try:
-            path = glob(MOTOR_DEVICE_GLOB)[0]
-        except IndexError:
-            raise IOError("No motor device found")
+        path = resolve_device(MOTOR_DEVICE_GLOB)
 
         self._device = KinesisMotor(
             path,
             scale=MOTOR_SCALE,  # type: ignore[arg-type]
         )
+        tune_serial_port(self._device)
 
         # Initialize the variables
         self.on_update = on_update
-        self.data: utils.DeviceTimeValues = []
+        self.data = utils.RingBuffer()
         self._current_speed = INVALID_SPEED
+        self._current_target = INVALID_POSITION
 
         # Initialize the thread
+        self._queue = CommandQueue()
+        self._stop_event = Event()
         self._thread = utils.start_thread(self._run_thread)
-        self._queue: Queue[
-            tuple[Callable[[float], None], float]
-            | tuple[Callable[[None], None], None]
-        ] = Queue()
 
         # Home the motor at startup
         self.home()
 
     def wait(self) -> None:
         """Waits for the motor to finish any current movement."""
-        sleep(2 * SLEEP_DURATION)
+        # Give the motor a moment to start moving, but stop waiting as
+        # soon as it reports motion instead of always sleeping the full
+        # two ticks.
+        start = monotonic()
+        while (
+            not self._device.is_moving()
+            and monotonic() - start < 2 * SLEEP_DURATION
+        ):
+            sleep(SPIN_DURATION)
+
         try:
             self._device.wait_for_stop()
         except ThorlabsError:
@@ -110,9 +317,12 @@ class Motor:
 
     def home(self) -> None:
         """Homes the motor."""
-        self._current_speed = INVALID_SPEED  # Invalidate current speed
-        self._queue.put((self._enable, None))
-        self._queue.put((self._home, None))
+        # Invalidate the current speed and target
+        self._current_speed = INVALID_SPEED
+        self._current_target = INVALID_POSITION
+
+        self._queue.put(self._enable)
+        self._queue.put(self._home)
 
     def _enable(self, _: None) -> None:
         self._device._enable_channel(enabled=True)
@@ -122,25 +332,30 @@ class Motor:
 
     def stop(self) -> None:
         """Stops the motor."""
-        self._queue.put((self._stop, None))
-        self._queue.put((self._set_speed, MOTOR_MAX_SPEED))
+        self._current_target = INVALID_POSITION  # Invalidate the target
+        self._queue.put(self._stop)
+        self._queue.put(self._set_speed, MOTOR_MAX_SPEED)
 
     def _stop(self, _: None) -> None:
         self._device.stop()
 
+    def close(self) -> None:
+        """Stops the polling thread."""
+        self._stop_event.set()
+
     @property
     def position(self) -> float:
         """Gets the current position of the mirror in millimeters."""
         try:
-            return self.data[-1][1]
+            return self.data.last
         except IndexError:
             sleep(2 * SLEEP_DURATION)
-            return self.data[-1][1]
+            return self.data.last
 
     def _get_position(self, _: None) -> None:
         """Gets the current position of the mirror and calls on_update."""
         position = self._device.get_position()
-        self.data.append((unix_time(), position))
+        self.data.append(unix_time(), position)
         self.on_update(position)
 
     def set_position(
@@ -148,8 +363,14 @@ class Motor:
     ) -> None:
         """Sets the position of the mirror in millimeters at a given speed."""
         if speed != self._current_speed:
-            self._queue.put((self._set_speed, speed))
-        self._queue.put((self._set_position, position))
+            self._queue.replace(self._set_speed, speed)
+
+        # Skip no-op moves: the GUI's gesture-release path often
+        # re-sends the target that the motor is already heading to.
+        if position == self._current_target:
+            return
+        self._current_target = position
+        self._queue.replace(self._set_position, position)
 
     def _set_position(self, position: float) -> None:
         self._device.move_to(position)
@@ -157,6 +378,11 @@ class Motor:
     def _set_speed(self, speed: float) -> None:
         """Sets the speed of the motor in millimeters/second."""
         self._current_speed = speed
+
+        # Retry with exponential backoff: transient failures usually
+        # clear within a couple of milliseconds, so waiting a full tick
+        # before the first retry just wastes time.
+        wait = RETRY_INITIAL_WAIT
         for _ in range(3):
             try:
                 self._device.setup_velocity(max_velocity=speed, scale=True)
@@ -168,36 +394,65 @@ class Motor:
                 if current_speed != speed:
                     raise ValueError("Speed not set correctly")
             except (ThorlabsError, ValueError):
-                sleep(SLEEP_DURATION)
+                sleep(wait)
+                wait *= 2
             else:
                 break
 
     def _run_thread(self) -> None:
         """Runs the thread."""
 
-        # Every second cycle, run a command from the queue. Otherwise, get the
-        # current position.
-        for should_get_position in cycle([True, False]):
-            # sleep(SLEEP_DURATION)
-            if should_get_position:
-                func, arg = self._get_position, None
-            else:
+        # Once per tick, poll the current position, then drain every
+        # pending command from the queue. Draining the whole queue each
+        # tick means that a burst of commands (home + set_speed +
+        # move_to) dispatches in a single tick instead of one-per-tick.
+
+        # Hoist the attribute lookups out of the hot loop; LOAD_FAST is
+        # noticeably cheaper than a chain of LOAD_ATTRs at 120Hz.
+        try_run = self._try_run
+        get_position = self._get_position
+        queue_get = self._queue.get_nowait
+        wake = self._queue.wake
+        stopping = self._stop_event.is_set
+
+        def drain() -> None:
+            while True:
                 try:
-                    func, arg = self._queue.get_nowait()
+                    func, arg = queue_get()
                 except Empty:
-                    pass
-
+                    break
+                try_run(func, arg)
+
+        deadline = monotonic()
+        while not stopping():
+            # Sleep until the next poll tick, but wake up as soon as the
+            # GUI enqueues a command so that new targets don't wait out
+            # the remainder of the tick.
+            while True:
+                remaining = deadline - SPIN_DURATION - monotonic()
+                if remaining <= 0:
+                    break
+                if wake.wait(remaining):
+                    wake.clear()
+                    drain()
+
+            deadline = wait_for_tick(deadline)
+            try_run(get_position, None)
+            drain()
+
+    def _try_run(self, func: Callable[[Any], None], arg: Any) -> None:
+        """Runs a command, retrying once on a device error."""
+        try:
+            func(arg)
+        except ThorlabsError:
+            # Ok, let's retry once
+            sleep(SLEEP_DURATION)
             try:
-                func(arg)  # type: ignore[arg-type]
-            except ThorlabsError:
-                # Ok, let's retry once
-                sleep(SLEEP_DURATION)
-                try:
-                    func(arg)  # type: ignore[arg-type]
-                except:
-                    print_exc()
-            except:
-                print_exc()
+                func(arg)
+            except Exception as exc:
+                _exception_reporter.record(exc)
+        except Exception as exc:
+            _exception_reporter.record(exc)
 
 
 class Detector:
@@ -205,28 +460,43 @@ class Detector:
 
     def __init__(self, on_update: Callable[[float], Any]) -> None:
         # Initialize the device
-        try:
-            path = glob(DETECTOR_DEVICE_GLOB)[0]
-        except IndexError:
-            raise IOError("No detector device found")
+        path = resolve_device(DETECTOR_DEVICE_GLOB)
 
         self._device = SCPIDevice(
             (path, DETECTOR_BAUD),
             timeout=DETECTOR_TIMEOUT,
             term_write=DETECTOR_NL,
         )
+        tune_serial_port(self._device)
 
         # Initialize the variables
         self.on_update = on_update
-        self.data: utils.DeviceTimeValues = []
+        self.data = utils.RingBuffer()
+
+        # The raw pylablib communication backend, used for the polling
+        # fast path; None for the mock devices.
+        self._backend = getattr(self._device, "instr", None)
 
         # Initialize the thread
         self._lock = Lock()
+        self._stop_event = Event()
         self._thread = utils.start_thread(self._run_thread)
 
         # Verify connection
-        if not self._device.get_id():
-            raise IOError("Failed to connect to detector")
+        with self._slow_timeout():
+            if not self._device.get_id():
+                raise IOError("Failed to connect to detector")
+
+    def _slow_timeout(self):
+        """Temporarily raises the serial timeout for slow commands.
+
+        The device is constructed with a timeout just long enough for
+        the sub-millisecond det:meas?/det:gain? replies, so commands
+        that make the firmware do real work need a longer one.
+        """
+        if self._backend is None:
+            return nullcontext()
+        return self._backend.using_timeout(DETECTOR_SLOW_TIMEOUT)
 
     @property
     def gain(self) -> int:
@@ -234,34 +504,96 @@ class Detector:
         with self._lock:
             value = self._device.ask("det:gain?", "int")
 
-        assert isinstance(value, int)
-        return value
+        return int(value)
 
     @gain.setter
     def gain(self, value: int) -> None:
         """Sets the position of the mirror in millimeters."""
-        with self._lock:
+        with self._lock, self._slow_timeout():
             self._device.write(f"det:gain {value}")
 
+            # The detector needs a moment to apply the new gain, so poll
+            # until it reads back correctly instead of sleeping a fixed
+            # settling time. Typically this returns on the first try.
+            for _ in range(GAIN_POLL_ATTEMPTS):
+                if self._device.ask("det:gain?", "int") == value:
+                    return
+                sleep(GAIN_POLL_INTERVAL)
+
+        raise IOError(f"Detector did not accept gain {value}")
+
+    def batch_ask(self, commands: tuple[str, ...]) -> list[str]:
+        """Sends several queries in a single serial round-trip.
+
+        SCPI supports semicolon-separated compound queries whose reply
+        is the semicolon-joined individual replies, so N queries cost
+        one round-trip instead of N.
+        """
+        with self._lock:
+            reply = self._device.ask(";:".join(commands))
+
+        return str(reply).split(";")
+
+    def snapshot(self) -> tuple[int, float]:
+        """Gets the current gain and intensity in a single round-trip."""
+        gain, intensity = self.batch_ask(("det:gain?", "det:meas?"))
+        return int(gain), int(intensity) / MAX_INTENSITY
+
     @property
     def intensity(self) -> float:
         """Gets the current light intensity reading from the detector."""
         with self._lock:
             value = self._device.ask("det:meas?", "int")
 
-        assert isinstance(value, int)
-        return value / MAX_INTENSITY
+        return int(value) / MAX_INTENSITY
+
+    def _read_intensity(self) -> float:
+        """Reads the intensity with as little overhead as possible.
+
+        pylablib's ask() goes through a generic reply parser with
+        per-call type dispatch; at 1/SLEEP_DURATION Hz that's noticeable
+        overhead on top of the serial round-trip, so the polling loop
+        writes the query and parses the integer reply directly. The
+        intensity property keeps using ask() for its better error
+        reporting.
+        """
+        if self._backend is None:
+            return self.intensity
+
+        with self._lock:
+            self._backend.write("det:meas?")
+            reply = self._backend.readline()
+        return int(reply) / MAX_INTENSITY
 
     def _run_thread(self) -> None:
         """Calls the on_update callback with the current intensity."""
-        while True:
-            # sleep(SLEEP_DURATION)
+
+        # Hoist the attribute lookups out of the hot loop; LOAD_FAST is
+        # noticeably cheaper than a chain of LOAD_ATTRs at 120Hz.
+        read_intensity = self._read_intensity
+        data_append = self.data.append
+        on_update = self.on_update
+        record_exc = _exception_reporter.record
+        stopping = self._stop_event.is_set
+
+        tick = 0
+        deadline = monotonic()
+        while not stopping():
+            deadline = wait_for_tick(deadline)
 
             try:
-                intensity = self.intensity
-            except:
-                print_exc()
+                intensity = read_intensity()
+            except Exception as exc:
+                record_exc(exc)
                 continue
 
-            self.data.append((unix_time(), intensity))
-            self.on_update(intensity)
+            # Store every sample, but only bother the GUI thread at a
+            # rate it can actually display.
+            data_append(unix_time(), intensity)
+            tick += 1
+            if tick % GUI_UPDATE_DIVISOR == 0:
+                on_update(intensity)
+
+    def close(self) -> None:
+        """Stops the polling thread."""
+        self._stop_event.set()
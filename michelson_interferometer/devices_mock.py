@@ -7,11 +7,15 @@
 ### Imports ###
 ###############
 
-from typing import Any
-from random import randint
-from time import sleep
+from logging import getLogger
+from math import copysign
+from typing import Any, Callable
+from os import environ
+from time import monotonic, sleep
 from collections import namedtuple
 
+from numpy.random import default_rng
+
 #################
 ### Constants ###
 #################
@@ -19,6 +23,27 @@ from collections import namedtuple
 MAX_INTENSITY = 2**16 - 1  # 16-bit detector
 SHORT_SLEEP = 1 / 2400  # seconds
 LONG_SLEEP = 1 / 6  # seconds
+NOISE_BUFFER_SIZE = 4096  # samples
+
+# Tracing every mock call with print() dominated the cost of the mocks
+# themselves (a formatted f-string plus a line-buffered stdout flush per
+# call); the logger is lazy, so a disabled level costs one comparison.
+log = getLogger(__name__)
+
+######################
+### Initialization ###
+######################
+
+# Skip the simulated device latencies (and the simulated motor travel
+# time) entirely when testing, so mock interactions aren't serialized
+# on wall-clock time.
+FAST_MODE = bool(environ.get("MICHELSON_MOCK_FAST"))
+
+if FAST_MODE:
+
+    def sleep(_: float) -> None:
+        pass
+
 
 #########################
 ### Class Definitions ###
@@ -27,48 +52,82 @@ LONG_SLEEP = 1 / 6  # seconds
 VelocityParameters = namedtuple("VelocityParameters", ["max_velocity"])
 
 
+class ThorlabsError(Exception):
+    """Mock ThorlabsError for testing purposes."""
+
+
 class KinesisMotor:
     """Mock KinesisMotor for testing purposes."""
 
     def __init__(self, path: str, scale: tuple[float, float, float]) -> None:
-        print(f"(KinesisMotor) __init__({path!r}, {scale!r})")
-        self._position = 0.0
+        log.debug("(KinesisMotor) __init__(%r, %r)", path, scale)
+        self._start_position = 0.0
+        self._target = 0.0
+        self._move_start = monotonic()
         self._speed = 0.0
 
+    def _position_now(self) -> float:
+        """The simulated position, interpolated along the current move
+        at the speed set by setup_velocity."""
+        if FAST_MODE or self._speed <= 0.0:
+            return self._target
+
+        delta = self._target - self._start_position
+        travelled = (monotonic() - self._move_start) * self._speed
+        if travelled >= abs(delta):
+            return self._target
+        return self._start_position + copysign(travelled, delta)
+
     def wait_for_stop(self) -> None:
-        print("(KinesisMotor) wait_for_stop()")
-        sleep(LONG_SLEEP)
+        log.debug("(KinesisMotor) wait_for_stop()")
+        while self._position_now() != self._target:
+            sleep(SHORT_SLEEP)
 
     def _enable_channel(self, enabled: bool) -> None:
-        print(f"(KinesisMotor) _enable_channel({enabled!r})")
+        log.debug("(KinesisMotor) _enable_channel(%r)", enabled)
         sleep(SHORT_SLEEP)
 
     def home(self, force: bool, sync: bool) -> None:
-        print(f"(KinesisMotor) home({force!r}, {sync!r})")
+        log.debug("(KinesisMotor) home(%r, %r)", force, sync)
         sleep(SHORT_SLEEP)
+        self._start_position = self._position_now()
+        self._target = 0.0
+        self._move_start = monotonic()
 
     def stop(self) -> None:
-        print("(KinesisMotor) stop()")
+        log.debug("(KinesisMotor) stop()")
         sleep(SHORT_SLEEP)
+        self._start_position = self._target = self._position_now()
 
     def get_position(self) -> float:
-        # print("(KinesisMotor) get_position() -> {self._position!r}")  # Too noisy
+        position = self._position_now()
+        log.debug("(KinesisMotor) get_position() -> %r", position)
         sleep(SHORT_SLEEP)
-        return self._position
+        return position
+
+    def is_moving(self) -> bool:
+        moving = self._position_now() != self._target
+        log.debug("(KinesisMotor) is_moving() -> %r", moving)
+        sleep(SHORT_SLEEP)
+        return moving
 
     def move_to(self, position: float) -> None:
-        print(f"(KinesisMotor) move_to({position!r})")
+        log.debug("(KinesisMotor) move_to(%r)", position)
         sleep(SHORT_SLEEP)
-        self._position = position
+        self._start_position = self._position_now()
+        self._target = position
+        self._move_start = monotonic()
 
     def setup_velocity(self, max_velocity: float, scale: bool) -> None:
-        print(f"(KinesisMotor) setup_velocity({max_velocity!r}, {scale!r})")
+        log.debug("(KinesisMotor) setup_velocity(%r, %r)", max_velocity, scale)
         sleep(SHORT_SLEEP)
         self._speed = max_velocity
 
     def get_velocity_parameters(self, scale: bool) -> VelocityParameters:
-        print(
-            f"(KinesisMotor) get_velocity_parameters({scale!r}) -> {self._speed!r}"
+        log.debug(
+            "(KinesisMotor) get_velocity_parameters(%r) -> %r",
+            scale,
+            self._speed,
         )
         sleep(SHORT_SLEEP)
         return VelocityParameters(max_velocity=self._speed)
@@ -80,33 +139,74 @@ class SCPIDevice:
     def __init__(
         self, conn: tuple[str, int], timeout: float, term_write: str
     ) -> None:
-        print(f"(SCPIDevice) __init__({conn!r}, {timeout!r}, {term_write!r})")
+        log.debug(
+            "(SCPIDevice) __init__(%r, %r, %r)", conn, timeout, term_write
+        )
 
         self._gain = 0
 
+        # Generate the simulated detector noise in batches: one numpy
+        # call per buffer is far cheaper than random.randint per sample.
+        self._rng = default_rng()
+        self._noise = self._rng.integers(
+            0, MAX_INTENSITY + 1, NOISE_BUFFER_SIZE
+        )
+        self._noise_index = 0
+
+        # Pre-built dispatch tables: one dict lookup per call instead
+        # of re-splitting the command string and walking match arms.
+        self._ask_table: dict[str, Callable[[], Any]] = {
+            "det:gain?": lambda: self._gain,
+            "det:meas?": self._measure,
+        }
+        self._write_table: dict[str, Callable[[str], None]] = {
+            "det:gain": self._write_gain,
+        }
+
     def get_id(self) -> str:
-        print('(SCPIDevice) get_idn() -> "MOCK_DEVICE,MODEL_1234,SN0001,1.0"')
+        log.debug(
+            '(SCPIDevice) get_idn() -> "MOCK_DEVICE,MODEL_1234,SN0001,1.0"'
+        )
         sleep(SHORT_SLEEP)
         return "MOCK_DEVICE,MODEL_1234,SN0001,1.0"
 
-    def ask(self, command: str, datatype: str) -> Any:
-        match command:
-            case "det:gain?":
-                value = self._gain
-            case "det:meas?":
-                value = randint(0, MAX_INTENSITY)
-            case _:
-                raise ValueError(f"Unknown command: {command!r}")
-
-        # print(f"(SCPIDevice) ask({command!r}, {datatype!r}) -> {value!r}")  # Too noisy
+    def ask(self, command: str, datatype: str = "string") -> Any:
+        # Compound (semicolon-separated) queries get one joined reply,
+        # just like a real SCPI device.
+        if ";" in command:
+            return ";".join(
+                str(self.ask(part.lstrip(":"), datatype))
+                for part in command.split(";")
+            )
+
+        handler = self._ask_table.get(command)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command!r}")
+        value = handler()
+
+        log.debug("(SCPIDevice) ask(%r, %r) -> %r", command, datatype, value)
         sleep(SHORT_SLEEP)
         return value
 
     def write(self, command: str) -> None:
-        print(f"(SCPIDevice) write({command!r})")
+        log.debug("(SCPIDevice) write(%r)", command)
         sleep(SHORT_SLEEP)
-        match command.split():
-            case ["det:gain", value]:
-                self._gain = int(value)
-            case _:
-                raise ValueError(f"Unknown command: {command!r}")
+
+        name, _, argument = command.partition(" ")
+        handler = self._write_table.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command!r}")
+        handler(argument)
+
+    def _measure(self) -> int:
+        value = int(self._noise[self._noise_index])
+        self._noise_index += 1
+        if self._noise_index == NOISE_BUFFER_SIZE:
+            self._noise = self._rng.integers(
+                0, MAX_INTENSITY + 1, NOISE_BUFFER_SIZE
+            )
+            self._noise_index = 0
+        return value
+
+    def _write_gain(self, argument: str) -> None:
+        self._gain = int(argument)
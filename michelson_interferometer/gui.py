@@ -7,14 +7,23 @@
 ### Imports ###
 ###############
 
+from os import environ
+
+# Keep NumPy's BLAS single-threaded: the plot worker shares the machine
+# with the GTK main loop and the device threads, and letting BLAS spawn
+# a thread per core just makes them fight each other. This must be set
+# before numpy is first imported (here, via the devices module).
+environ.setdefault("OMP_NUM_THREADS", "1")
+environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+environ.setdefault("MKL_NUM_THREADS", "1")
+
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from threading import Thread
-from time import sleep
+from queue import Empty, Queue
+from traceback import print_exception
 
-import numpy as np
-
-from . import devices, plots, utils
+from . import devices, utils
 
 # GTK imports
 import gi
@@ -30,16 +39,13 @@ from gi.repository import Adw, Gio, GLib, Gtk  # type: ignore
 
 APP_NAME = "Michelson Interferometer"
 APP_ID = "ca.maxchernoff.michelson_interferometer"
+APP_VERSION = "1.0.0"  # %%version
+APP_WEBSITE = "https://github.com/gucci-on-fleek/michelson-interferometer"
+APP_DEVELOPER = "Max Chernoff"
 
 UI_PATH = Path(__file__).parent
 PLOT_UPDATE_INTERVAL = 1.0  # seconds
-TSV_HEADER = (
-    "motor_time",
-    "motor_position",
-    "detector_time",
-    "detector_intensity",
-)
-MISSING_DATA_VALUE = np.nan
+GAIN_DEBOUNCE_INTERVAL = 0.150  # seconds
 
 #########################
 ### Class Definitions ###
@@ -65,7 +71,6 @@ class MainWindow(Adw.ApplicationWindow):
     __gtype_name__ = "MainWindow"
 
     # UI Elements
-    about_dialog: Adw.AboutDialog = Gtk.Template.Child()
     device_error_dialog: Adw.AlertDialog = Gtk.Template.Child()
     final_position: Adw.SpinRow = Gtk.Template.Child()
     gain: Adw.SpinRow = Gtk.Template.Child()
@@ -82,6 +87,13 @@ class MainWindow(Adw.ApplicationWindow):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
+        # Cache the position row as a plain attribute: it's the one
+        # widget touched on every motor update (60Hz while polling), and
+        # each Gtk.Template.Child access goes through a GObject property
+        # lookup. The template children are set once at construction and
+        # never change, so caching is safe.
+        self._position_row = self.position
+
         # Style the window if we're testing
         if devices.fake_devices:
             self.add_css_class("devel")
@@ -89,22 +101,26 @@ class MainWindow(Adw.ApplicationWindow):
         # Register the "about" action
         self._register_about_action()
 
+        # Coalesce device updates: the device threads only store the
+        # newest value here, and schedule at most one idle callback at
+        # a time, so a burst of samples costs a single main-loop
+        # dispatch instead of one each.
+        self._pending_intensity: float | None = None
+        self._detector_idle_pending = False
+        self._pending_position: float | None = None
+        self._position_idle_pending = False
+
         # Initialize the devices
         try:
-            self.motor = devices.Motor(
-                on_update=lambda value: GLib.idle_add(self.set_position, value)
-            )
-            self.detector = devices.Detector(
-                on_update=lambda value: GLib.idle_add(
-                    self.update_detector, value
-                )
-            )
+            self.motor = devices.Motor(on_update=self._queue_position)
+            self.detector = devices.Detector(on_update=self._queue_detector)
         except:
             self.device_error_dialog.present()
             raise
 
-        # Initialize the plotter
-        self._initialize_plotter()
+        # Initialize the plotter once the main loop is running, so the
+        # window paints before we pay for the matplotlib import.
+        GLib.idle_add(self._initialize_plotter)
 
         # Initialize the position adjustment
         self._initialize_position_adjustment()
@@ -112,12 +128,28 @@ class MainWindow(Adw.ApplicationWindow):
         # Initialize variables
         self.current_motion = self.stop_motion_button
         self.ignore_position_changes = False
-        self.motion_thread: Thread | None = None
-        self.motion_should_stop = False
+
+        # One persistent worker runs the motion commands; rapid clicks
+        # coalesce in the single-slot queue instead of each spawning a
+        # thread that races the others for the motor.
+        self._motion_queue: Queue[tuple[float, float]] = Queue(maxsize=1)
+        utils.start_thread(self._motion_loop)
+
+        # Stop the device threads promptly on close instead of leaving
+        # them to finish their current tick while the process lingers.
+        self.connect("close-request", self._on_close_request)
 
         # Update the gain
+        self._pending_gain = 0
+        self._gain_timeout: int | None = None
         self.gain_changed(self.gain)
 
+    def _on_close_request(self, *_) -> bool:
+        """Handle the window being closed."""
+        self.motor.close()
+        self.detector.close()
+        return False  # Let GTK continue closing the window
+
     @Gtk.Template.Callback()
     def device_error_dialog_exit(self, *_) -> None:
         """Quit the application."""
@@ -127,34 +159,122 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _register_about_action(self) -> None:
         """Register the "about" action."""
+        # The dialog itself is built on first use: most sessions never
+        # open it, so there's no point realizing it at startup.
+        self._about_dialog: Adw.AboutDialog | None = None
+
         action = Gio.SimpleAction.new("about", None)
-        action.connect(
-            "activate", lambda action, param: self.about_dialog.present()
-        )
+        action.connect("activate", self._show_about_dialog)
         self.add_action(action)
 
-    def _initialize_plotter(self) -> None:
+    def _show_about_dialog(self, *_) -> None:
+        """Handle the "about" action."""
+        if self._about_dialog is None:
+            self._about_dialog = Adw.AboutDialog(
+                application_name=APP_NAME,
+                developer_name=APP_DEVELOPER,
+                version=APP_VERSION,
+                license_type=Gtk.License.MPL_2_0,
+                website=APP_WEBSITE,
+                application_icon=APP_ID,
+            )
+        self._about_dialog.present(self)
+
+    def _initialize_plotter(self) -> bool:
         """Initialize the plotter."""
+        # Deferred import: this pulls in all of matplotlib, which takes
+        # noticeably longer than everything else in the startup path.
+        from . import plots
+
         # Create the plotter
         self.plotter = plots.Plotter(plot_mode=self.plot_mode)
         self.plot_bin.set_child(self.plotter.canvas)
-        utils.start_thread(self._plot_thread)
 
-    def _plot_thread(self) -> None:
-        """Thread that continuously updates the plot."""
-        while True:
-            sleep(PLOT_UPDATE_INTERVAL)
-            self.plotter.draw_plot(
-                np.array(self.detector.data),
-                np.array(self.motor.data),
+        # The heavy data preparation (interpolation, Lomb-Scargle) runs
+        # on a single worker thread; only the artist updates and the
+        # actual canvas draw happen on the main loop. The busy flag
+        # provides back-pressure: while a preparation is still in
+        # flight, ticks are skipped instead of queueing up behind it.
+        self._plot_executor = ThreadPoolExecutor(max_workers=1)
+        self._plot_busy = False
+        self._last_plot_state: tuple[str | None, int, int] = (None, -1, -1)
+        GLib.timeout_add(int(PLOT_UPDATE_INTERVAL * 1000), self._schedule_plot)
+
+        # Repaint with the new palette when the user toggles dark mode;
+        # the per-draw path only ever reads the cached colours.
+        Adw.StyleManager.get_default().connect(
+            "notify::dark", self._on_dark_changed
+        )
+
+        # Don't bother rendering while the window isn't on screen;
+        # catch up with one full redraw as soon as it reappears.
+        self._window_visible = self.get_mapped()
+        self.connect("map", self._on_map_changed, True)
+        self.connect("unmap", self._on_map_changed, False)
+        return GLib.SOURCE_REMOVE
+
+    def _on_map_changed(self, window, visible: bool) -> None:
+        """Handle the window being mapped or unmapped."""
+        self._window_visible = visible
+        if visible:
+            self._last_plot_state = (None, -1, -1)  # Force the next redraw
+
+    def _on_dark_changed(self, *_) -> None:
+        """Handle the system switching between light and dark mode."""
+        self.plotter.refresh_theme()
+        self._last_plot_state = (None, -1, -1)  # Force the next redraw
+
+    def _schedule_plot(self) -> bool:
+        """Periodically kicks off a plot redraw."""
+        if self._plot_busy or not self._window_visible:
+            return GLib.SOURCE_CONTINUE
+
+        # Skip the redraw entirely when nothing changed since the last
+        # one (the motor stopped, the detector paused, same plot mode).
+        plot_state = (
+            self.plot_mode.get_active_name(),
+            self.detector.data.version,
+            self.motor.data.version,
+        )
+        if plot_state == self._last_plot_state:
+            return GLib.SOURCE_CONTINUE
+        self._last_plot_state = plot_state
+        self._plot_busy = True
+
+        future = self._plot_executor.submit(
+            self.plotter.prepare_plot,
+            plot_state[0],
+            self.detector.data.series,
+            self.motor.data.series,
+        )
+        # The canvas redraw is the least urgent thing on the main loop;
+        # running it at low priority keeps button clicks and the device
+        # readouts responsive while a draw is pending.
+        future.add_done_callback(
+            lambda future: GLib.idle_add(
+                self._finish_plot, future, priority=GLib.PRIORITY_LOW
             )
+        )
+        return GLib.SOURCE_CONTINUE
+
+    def _finish_plot(self, future: Future) -> bool:
+        """Applies a prepared plot update on the main loop."""
+        self._plot_busy = False
+
+        payload = future.result()
+        if payload is not None:
+            self.plotter.apply_plot(payload)
+        return GLib.SOURCE_REMOVE
 
     def _initialize_position_adjustment(self) -> None:
         """Initialize the position adjustment."""
         # We need this code so that we don't try and adjust the position while
-        # the user is still interacting with the position widgets.
+        # the user is still interacting with the position widgets. Instead of
+        # re-checking a "deferred?" flag on every value change, the gesture
+        # handlers swap which action position_changed runs.
         self._future_position: float | None = None
         self._defer_position_update = False
+        self._position_action = self.motor.set_position
 
         gesture = Gtk.GestureClick.new()
         gesture.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
@@ -165,10 +285,16 @@ class MainWindow(Adw.ApplicationWindow):
     def _on_position_gesture_pressed(self, *_) -> None:
         """Handle the user starting to interact with the position widgets."""
         self._defer_position_update = True
+        self._position_action = self._defer_position
+
+    def _defer_position(self, value: float) -> None:
+        """Remember a position change to apply once the user lets go."""
+        self._future_position = value
 
     def _on_position_gesture_released(self, *_) -> None:
         """Handle the user finishing interaction with the position widgets."""
         self._defer_position_update = False
+        self._position_action = self.motor.set_position
         if self._future_position is not None:
             self.motor.set_position(self._future_position)
             self._future_position = None
@@ -177,24 +303,33 @@ class MainWindow(Adw.ApplicationWindow):
         """Set the position spinner value."""
         self.ignore_position_changes = True
         if not self._defer_position_update:
-            self.position.set_value(value)
+            self._position_row.set_value(value)
         self.ignore_position_changes = False
 
     @Gtk.Template.Callback()
     def position_changed(self, scale: Gtk.Scale) -> None:
         """Handle changes to the position spinner."""
         if not self.ignore_position_changes:
-            if self._defer_position_update:
-                self._future_position = scale.get_value()
-            else:
-                value = scale.get_value()
-                self.motor.set_position(value)
+            self._position_action(scale.get_value())
 
     @Gtk.Template.Callback()
     def gain_changed(self, spinner: Adw.SpinRow) -> None:
         """Handle changes to the gain spinner."""
-        value = spinner.get_value()
-        self.detector.gain = int(value)
+        # Writing the gain is a blocking serial transaction (write plus
+        # readback polling), so bursts of spinner changes are debounced:
+        # only the value that survives a quiet interval is sent.
+        self._pending_gain = int(spinner.get_value())
+        if self._gain_timeout is not None:
+            GLib.source_remove(self._gain_timeout)
+        self._gain_timeout = GLib.timeout_add(
+            int(GAIN_DEBOUNCE_INTERVAL * 1000), self._flush_gain
+        )
+
+    def _flush_gain(self) -> bool:
+        """Applies the most recent queued gain change."""
+        self._gain_timeout = None
+        self.detector.gain = self._pending_gain
+        return GLib.SOURCE_REMOVE
 
     @Gtk.Template.Callback()
     def home_motor(self, button: Adw.ButtonRow) -> None:  # type: ignore
@@ -222,8 +357,7 @@ class MainWindow(Adw.ApplicationWindow):
         """Handle the "Run Backwards" button press."""
         self.set_current_motion(button)
 
-        self.motion_thread = utils.start_thread(
-            self._go_with_speed,
+        self._queue_motion(
             self.initial_position.get_value(),
             self.speed.get_value(),
         )
@@ -262,8 +396,7 @@ class MainWindow(Adw.ApplicationWindow):
         """Handle the "Run Forwards" button press."""
         self.set_current_motion(button)
 
-        self.motion_thread = utils.start_thread(
-            self._go_with_speed,
+        self._queue_motion(
             self.final_position.get_value(),
             self.speed.get_value(),
         )
@@ -278,11 +411,32 @@ class MainWindow(Adw.ApplicationWindow):
 
         self.set_current_motion(self.stop_motion_button)
 
+    def _queue_motion(self, end: float, speed: float) -> None:
+        """Queues a motion command, superseding any unstarted one."""
+        try:
+            self._motion_queue.get_nowait()
+        except Empty:
+            pass
+        self._motion_queue.put((end, speed))
+
+    def _motion_loop(self) -> None:
+        """Thread that runs the queued motion commands."""
+        while True:
+            end, speed = self._motion_queue.get()
+            # A transient device fault must not kill the only motion
+            # worker, so report it and wait for the next command; the
+            # button styling is reset either way.
+            try:
+                self._go_with_speed(end, speed)
+            except Exception as exception:
+                print_exception(exception)
+            finally:
+                GLib.idle_add(self.set_current_motion, self.stop_motion_button)
+
     def _go_with_speed(self, end: float, speed: float) -> None:
-        """Thread that moves the motor to a position at a given speed."""
+        """Moves the motor to a position at a given speed."""
         self.motor.set_position(end, speed)
         self.motor.wait()
-        GLib.idle_add(self.set_current_motion, self.stop_motion_button)
 
     @Gtk.Template.Callback()
     def save_data(self, button: Adw.SplitButton) -> None:
@@ -306,8 +460,31 @@ class MainWindow(Adw.ApplicationWindow):
 
         path = Path(name).with_suffix(".tsv")
 
-        # Save the data
-        utils.save_data(path, self.motor.data, self.detector.data)
+        # Format the TSV on a worker thread (polars releases the GIL
+        # for the bulk of it), then write it asynchronously through
+        # GIO, so a multi-megabyte export never stalls the main loop.
+        utils.start_thread(self._format_data_thread, path)
+
+    def _format_data_thread(self, path: Path) -> None:
+        """Thread that formats the data for saving."""
+        contents = utils.format_data(self.motor.data, self.detector.data)
+        GLib.idle_add(self._write_data, path, contents)
+
+    def _write_data(self, path: Path, contents: bytes) -> bool:
+        """Starts the asynchronous write of the formatted data."""
+        Gio.File.new_for_path(str(path)).replace_contents_bytes_async(
+            GLib.Bytes.new_take(contents),
+            None,
+            False,
+            Gio.FileCreateFlags.REPLACE_DESTINATION,
+            None,
+            self._on_save_finished,
+        )
+        return GLib.SOURCE_REMOVE
+
+    def _on_save_finished(self, file: Gio.File, task: Gio.Task) -> None:
+        """Handle the completion of an asynchronous data save."""
+        file.replace_contents_finish(task)
 
     @Gtk.Template.Callback()
     def clear_data(self, button: Gtk.Button) -> None:
@@ -315,7 +492,37 @@ class MainWindow(Adw.ApplicationWindow):
         self.motor.data.clear()
         self.detector.data.clear()
 
-    def update_detector(self, value: int) -> None:
+    def _queue_position(self, value: float) -> None:
+        """Queues a position update from the motor thread."""
+        self._pending_position = value
+        if not self._position_idle_pending:
+            self._position_idle_pending = True
+            GLib.idle_add(self._flush_position)
+
+    def _flush_position(self) -> bool:
+        """Applies the most recent queued position update."""
+        self._position_idle_pending = False
+        value = self._pending_position
+        if value is not None:
+            self.set_position(value)
+        return GLib.SOURCE_REMOVE
+
+    def _queue_detector(self, value: float) -> None:
+        """Queues a detector update from the detector thread."""
+        self._pending_intensity = value
+        if not self._detector_idle_pending:
+            self._detector_idle_pending = True
+            GLib.idle_add(self._flush_detector)
+
+    def _flush_detector(self) -> bool:
+        """Applies the most recent queued detector update."""
+        self._detector_idle_pending = False
+        value = self._pending_intensity
+        if value is not None:
+            self.update_detector(value)
+        return GLib.SOURCE_REMOVE
+
+    def update_detector(self, value: float) -> None:
         """Callback function to update the detector value display."""
         pass
 
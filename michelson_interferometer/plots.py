@@ -8,10 +8,13 @@
 ###############
 
 from math import ceil
+from typing import Any, Callable
 
+import cairo
 import matplotlib.pyplot as plt
 import matplotlib.style as mplstyle
 import numpy as np
+from matplotlib import cbook
 from matplotlib.backends.backend_gtk4agg import (
     FigureCanvasGTK4Agg as FigureCanvas,
 )
@@ -27,7 +30,7 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Adw, Gdk, Gtk  # type: ignore
+from gi.repository import Adw, Gdk, GLib, Gtk  # type: ignore
 
 ########################
 ### Type Definitions ###
@@ -35,6 +38,9 @@ from gi.repository import Adw, Gdk, Gtk  # type: ignore
 
 RGBAColour = tuple[float, float, float, float]
 
+# A prepared plot update: (plot mode, mode-specific data).
+PlotPayload = tuple[str, Any]
+
 
 #################
 ### Constants ###
@@ -74,9 +80,25 @@ def _spectral_colourmap(wavelength: float) -> RGBColour:
     return SPECTRAL_COLOURS[nm]
 
 
+# The wavelength axis is a fixed linspace, so every redraw asks for the
+# same colours; remember the last answer instead of rebuilding the array.
+_colourmap_cache: tuple[tuple[int, float, float], np.ndarray] | None = None
+
+
 def spectral_colourmap(wavelengths: np.ndarray) -> np.ndarray:
     """Get the RGB colours for a given array of wavelengths in metres."""
-    return np.array([_spectral_colourmap(wl) for wl in wavelengths])
+    global _colourmap_cache
+
+    if not len(wavelengths):
+        return np.empty((0, 3))
+
+    key = (len(wavelengths), float(wavelengths[0]), float(wavelengths[-1]))
+    if _colourmap_cache is not None and _colourmap_cache[0] == key:
+        return _colourmap_cache[1]
+
+    colours = np.array([_spectral_colourmap(wl) for wl in wavelengths])
+    _colourmap_cache = (key, colours)
+    return colours
 
 
 #########################
@@ -84,6 +106,60 @@ def spectral_colourmap(wavelengths: np.ndarray) -> np.ndarray:
 #########################
 
 
+class CachedCanvas(FigureCanvas):
+    """A canvas that keeps the converted cairo surface between repaints.
+
+    The stock GTK4 Agg canvas converts the entire Agg RGBA buffer into a
+    premultiplied ARGB32 cairo surface on every GTK draw event — even
+    when the repaint was caused by a popover or hover and the figure
+    itself hasn't changed. We cache the converted surface and only
+    rebuild it when matplotlib actually re-renders the figure.
+    """
+
+    _cached_surface: cairo.ImageSurface | None = None
+
+    def draw(self) -> None:
+        # Every real re-render comes through here (including draw_idle,
+        # resizes, and DPI changes), so this is the one invalidation
+        # point the cache needs.
+        self._cached_surface = None
+        super().draw()
+
+    def on_draw_event(self, widget, ctx) -> bool:
+        # Flush any pending idle draw first, as the stock canvas does
+        if self._idle_draw_id:
+            GLib.source_remove(self._idle_draw_id)
+            self._idle_draw_id = 0
+            self.draw()
+
+        allocation = self.get_allocation()
+        Gtk.render_background(
+            self.get_style_context(),
+            ctx,
+            allocation.x,
+            allocation.y,
+            allocation.width,
+            allocation.height,
+        )
+
+        if self._cached_surface is None:
+            buf = cbook._unmultiplied_rgba8888_to_premultiplied_argb32(
+                np.asarray(self.get_renderer().buffer_rgba())
+            )
+            height, width, _ = buf.shape
+            image = cairo.ImageSurface.create_for_data(
+                buf.ravel().data, cairo.FORMAT_ARGB32, width, height
+            )
+            scale = self.device_pixel_ratio
+            image.set_device_scale(scale, scale)
+            self._cached_surface = image
+
+        ctx.set_source_surface(self._cached_surface, 0, 0)
+        ctx.paint()
+
+        return False
+
+
 class Plotter:
     """Class to handle matplotlib plotting in the GUI."""
 
@@ -105,9 +181,31 @@ class Plotter:
 
         # Variables
         self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = CachedCanvas(self.figure)
         self.plot_mode = plot_mode
 
+        # The axes and artists persist between draws and are rebuilt
+        # only when the plot mode changes; each draw just pushes the new
+        # data into the existing artists, which avoids re-running the
+        # whole figure layout every second.
+        self._current_mode: str | None = None
+        self._artists: dict[str, Any] = {}
+        self._by_position_cache: tuple[tuple, utils.FloatColumns] | None = None
+
+        # Dispatch table mapping each plot mode to its (build, apply)
+        # function pair
+        self._plot_funcs: dict[str, tuple[Callable, Callable]] = {
+            "time": (self._build_time_axes, self._apply_time_plots),
+            "distance": (
+                self._build_distance_axes,
+                self._apply_distance_plots,
+            ),
+            "wavelength": (
+                self._build_wavelength_axes,
+                self._apply_wavelength_plots,
+            ),
+        }
+
     def _set_font(self) -> None:
         """Set the matplotlib font parameters."""
         # Get the font name and size
@@ -190,13 +288,8 @@ class Plotter:
 
         plt.rcParams["axes.prop_cycle"] = cycler(color=plot_colours)
 
-    def draw_time_plots(
-        self,
-        detector_data: utils.FloatColumns,
-        motor_data: utils.FloatColumns,
-        plot_spacing: int,
-    ) -> None:
-        """Draw the data as a function of time on the figure."""
+    def _build_time_axes(self) -> None:
+        """Create the axes and artists for the time plots."""
         # Create the axes
         intensity_axis = self.figure.add_subplot()
         position_axis = intensity_axis.twinx()
@@ -207,35 +300,38 @@ class Plotter:
         position_axis.set_ylabel("Position (mm)")
         position_axis.grid(visible=False)
 
-        # Plot the data
-        try:
-            intensity_axis.plot(
-                detector_data[:, 0] - detector_data[0, 0],
-                detector_data[:, 1] * 100,
-                ".C0",
-                label="Detector",
-                markevery=plot_spacing,
-            )
-            position_axis.plot(
-                motor_data[:, 0] - motor_data[0, 0],
-                motor_data[:, 1],
-                ".C1",
-                label="Mirror",
-                markevery=plot_spacing,
-            )
-        except IndexError:
-            pass
+        # Create the (initially empty) artists
+        (detector_line,) = intensity_axis.plot([], [], ".C0", label="Detector")
+        (mirror_line,) = position_axis.plot([], [], ".C1", label="Mirror")
+
+        self._artists = {
+            "intensity_axis": intensity_axis,
+            "position_axis": position_axis,
+            "detector_line": detector_line,
+            "mirror_line": mirror_line,
+        }
 
-    def draw_distance_plots(
+    def _apply_time_plots(
         self,
-        detector_data: utils.FloatColumns,
-        motor_data: utils.FloatColumns,
-        plot_spacing: int,
+        data: tuple[utils.FloatSeries, utils.FloatSeries],
     ) -> None:
-        """Draw the data as a function of distance on the figure."""
-        motor, detector = utils.parse_data(motor_data, detector_data)
-        by_position = utils.interpolate_motion(motor, detector)
+        """Update the time-plot artists with the given data."""
+        (detector_time, detector_intensity), (motor_time, motor_position) = data
 
+        # The times are already relative to the start of the acquisition
+        detector_line = self._artists["detector_line"]
+        detector_line.set_data(detector_time, detector_intensity * 100)
+
+        mirror_line = self._artists["mirror_line"]
+        mirror_line.set_data(motor_time, motor_position)
+
+        for axis_name in ("intensity_axis", "position_axis"):
+            axis = self._artists[axis_name]
+            axis.relim()
+            axis.autoscale_view()
+
+    def _build_distance_axes(self) -> None:
+        """Create the axes and artists for the distance plots."""
         # Create the axis
         intensity_axis = self.figure.add_subplot()
 
@@ -243,37 +339,33 @@ class Plotter:
         intensity_axis.set_xlabel("Position (mm)")
         intensity_axis.set_ylabel("Intensity (%)")
 
-        # Plot the data
-        intensity_axis.plot(
-            by_position[:, 0],
-            by_position[:, 1] * 100,
-            ".C0",
-            label="Intensity",
-            markevery=plot_spacing,
+        # Create the (initially empty) artist
+        (intensity_line,) = intensity_axis.plot(
+            [], [], ".C0", label="Intensity"
         )
 
-    def draw_wavelength_plots(
+        self._artists = {
+            "intensity_axis": intensity_axis,
+            "intensity_line": intensity_line,
+        }
+
+    def _apply_distance_plots(
         self,
-        detector_data: utils.FloatColumns,
-        motor_data: utils.FloatColumns,
-        plot_spacing: int,
+        by_position: utils.FloatColumns,
     ) -> None:
-        """Draw the data as a function of time, using a Fourier transform."""
-        # Get the data by position
-        motor, detector = utils.parse_data(motor_data, detector_data)
-        by_position = utils.interpolate_motion(motor, detector)
+        """Update the distance-plot artists with the given data."""
+        intensity_line = self._artists["intensity_line"]
+        intensity_line.set_data(
+            by_position[:, 0],
+            by_position[:, 1] * 100,
+        )
 
-        # Perform the Lomb-Scargle transform
-        try:
-            wavelengths, spectral_power = utils.lomb_scargle(
-                distances=by_position[:, 0] * MILLIMETRES_TO_METRES,
-                intensities=by_position[:, 1],
-                sample_count=LOMB_SCARGLE_SAMPLES,
-            )
-        except ValueError:
-            return
-        spectral_power = utils.remove_noise_floor(spectral_power)
+        axis = self._artists["intensity_axis"]
+        axis.relim()
+        axis.autoscale_view()
 
+    def _build_wavelength_axes(self) -> None:
+        """Create the axes and artists for the wavelength plots."""
         # Create the axis
         intensity_axis = self.figure.add_subplot()
 
@@ -281,51 +373,180 @@ class Plotter:
         intensity_axis.set_xlabel("Wavelength (nm)")
         intensity_axis.set_ylabel("Spectral Power (%)")
 
-        # Plot the data
-        intensity_axis.scatter(
-            x=wavelengths * METRES_TO_NANOMETRES,
-            y=spectral_power,
+        # Create the (initially empty) artist
+        scatter = intensity_axis.scatter(
+            x=[],
+            y=[],
             s=5,
-            c=spectral_colourmap(wavelengths),
             alpha=0.75,
             label="Spectral Power",
         )
 
-    def draw_plot(
+        self._artists = {
+            "intensity_axis": intensity_axis,
+            "scatter": scatter,
+        }
+
+    def _apply_wavelength_plots(
         self,
-        detector_data: utils.FloatColumns,
-        motor_data: utils.FloatColumns,
+        data: tuple[utils.FloatArray, utils.FloatArray],
     ) -> None:
-        """Redraw the plot with the given data."""
+        """Update the wavelength-plot artists with the given data."""
+        wavelengths, spectral_power = data
 
-        # Create the figure and axes
+        scatter = self._artists["scatter"]
+        scatter.set_offsets(
+            np.column_stack(
+                (wavelengths * METRES_TO_NANOMETRES, spectral_power)
+            )
+        )
+        scatter.set_facecolor(spectral_colourmap(wavelengths))
+
+        # relim() only considers lines, so feed the scatter offsets to
+        # the data limits directly.
+        axis = self._artists["intensity_axis"]
+        axis.dataLim.update_from_data_xy(scatter.get_offsets(), ignore=True)
+        axis.autoscale_view()
+
+    def refresh_theme(self) -> None:
+        """Re-reads the theme colours after a light/dark switch.
+
+        The colours are baked into the artists when the axes are built,
+        so this just updates the rcParams and forces a rebuild on the
+        next draw.
+        """
+        self._set_foreground_colour(self.plot_mode)
+        self._set_plot_colours()
+        self._current_mode = None
+
+    def _build_axes(self, build_func: Callable[[], None]) -> None:
+        """Rebuild the figure for a new plot mode."""
         self.figure.clear(keep_observers=True)
+        build_func()
+
+        # Add the legends
+        legend = self.figure.legend(loc="outside upper right")
 
-        # Determine the plot spacing
-        num_points = max(len(detector_data), len(motor_data))
+        # Ugh, we can't set this properly via rcParams
+        legend.get_frame().set_alpha(None)
+        legend.get_frame().set_facecolor(TRANSPARENT_COLOUR)
+
+    def _interpolated(
+        self,
+        detector_data: utils.FloatSeries,
+        motor_data: utils.FloatSeries,
+    ) -> utils.FloatColumns:
+        """Interpolates the motion, reusing the previous result.
+
+        Switching between the distance and wavelength modes (or
+        redrawing either while acquisition is paused) would otherwise
+        redo the same sort-and-join on identical data.
+        """
+        detector_time, motor_time = detector_data[0], motor_data[0]
+        key = (
+            len(detector_time),
+            len(motor_time),
+            float(detector_time[-1]) if len(detector_time) else 0.0,
+            float(motor_time[-1]) if len(motor_time) else 0.0,
+        )
+
+        cached = self._by_position_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        motor, detector = utils.parse_data(motor_data, detector_data)
+        by_position = utils.interpolate_motion(motor, detector)
+        self._by_position_cache = (key, by_position)
+        return by_position
+
+    def prepare_plot(
+        self,
+        plot_mode: str,
+        detector_data: utils.FloatSeries,
+        motor_data: utils.FloatSeries,
+    ) -> PlotPayload | None:
+        """Computes everything needed for the next redraw.
+
+        This does the heavy number crunching (interpolation and the
+        Lomb-Scargle transform) but touches no GTK or canvas state, so
+        it's safe to run off the main thread. Returns None when there's
+        nothing to draw.
+        """
+        # Nothing to draw (yet)
+        num_points = max(len(detector_data[0]), len(motor_data[0]))
+        if not num_points:
+            return None
+
+        # Long histories are decimated by slicing before they ever
+        # reach matplotlib: past a thousand or so points the extra
+        # samples only add rasterization and transform cost, not detail.
         plot_spacing = max(1, ceil(num_points / MAX_PLOT_POINTS))
-        print(f"Plot spacing: {plot_spacing}")
-        print(f"Number of points: {num_points // plot_spacing}")
 
-        # Draw the data
-        plot_mode: str = self.plot_mode.get_active_name()
+        # Compute the data for the current plot mode
+        data: Any
         match plot_mode:
             case "time":
-                plot_func = self.draw_time_plots
+                data = (
+                    tuple(array[::plot_spacing] for array in detector_data),
+                    tuple(array[::plot_spacing] for array in motor_data),
+                )
             case "distance":
-                plot_func = self.draw_distance_plots
+                data = self._interpolated(detector_data, motor_data)[
+                    ::plot_spacing
+                ]
             case "wavelength":
-                plot_func = self.draw_wavelength_plots
+                by_position = self._interpolated(detector_data, motor_data)
+
+                try:
+                    wavelengths, spectral_power = utils.lomb_scargle(
+                        distances=by_position[:, 0] * MILLIMETRES_TO_METRES,
+                        intensities=by_position[:, 1],
+                        sample_count=LOMB_SCARGLE_SAMPLES,
+                    )
+                except ValueError:
+                    return None
+                data = (
+                    wavelengths,
+                    utils.remove_noise_floor(spectral_power),
+                )
             case _:
                 raise ValueError(f"Unknown plot mode: {plot_mode}")
-        plot_func(detector_data, motor_data, plot_spacing)
 
-        # Add the legends
-        legend = self.figure.legend(loc="outside upper right")
+        return plot_mode, data
 
-        # Ugh, we can't set this properly via rcParams
-        legend.get_frame().set_alpha(None)
-        legend.get_frame().set_facecolor(TRANSPARENT_COLOUR)
+    def apply_plot(self, payload: PlotPayload) -> None:
+        """Pushes a prepared payload into the artists and redraws.
+
+        This mutates the canvas, so it must run on the main thread.
+        """
+        plot_mode, data = payload
 
-        # Redraw the canvas
-        self.canvas.draw()
+        try:
+            build_func, apply_func = self._plot_funcs[plot_mode]
+        except KeyError:
+            raise ValueError(f"Unknown plot mode: {plot_mode}") from None
+
+        # Rebuild the axes only when the mode changed, then push the new
+        # data into the persistent artists
+        if plot_mode != self._current_mode:
+            self._build_axes(build_func)
+            self._current_mode = plot_mode
+        apply_func(data)
+
+        # Schedule the redraw: draw_idle lets the frame clock collapse
+        # several pending updates into a single Agg render.
+        self.canvas.draw_idle()
+
+    def draw_plot(
+        self,
+        detector_data: utils.FloatSeries,
+        motor_data: utils.FloatSeries,
+    ) -> None:
+        """Synchronously redraws the plot with the given data."""
+        payload = self.prepare_plot(
+            self.plot_mode.get_active_name(),
+            detector_data,
+            motor_data,
+        )
+        if payload is not None:
+            self.apply_plot(payload)
@@ -7,7 +7,7 @@
 ### Imports ###
 ###############
 
-from pathlib import Path
+from io import BytesIO
 from threading import Thread
 from typing import Callable
 
@@ -22,14 +22,19 @@ from scipy import signal
 # 2-column numpy array, used for processing the data.
 FloatColumns = np.ndarray[tuple, np.dtype[np.float64]]
 
-# List of (time, value) tuples. We're using this instead of a numpy array
-# because Python lists are thread-safe.
-DeviceTimeValues = list[tuple[float, float]]
+# 1-dimensional numpy array of sample times or values.
+FloatArray = np.ndarray[tuple, np.dtype[np.float64]]
+
+# Parallel (times, values) arrays, as returned by RingBuffer.series.
+FloatSeries = tuple[FloatArray, FloatArray]
 
 #################
 ### Constants ###
 #################
 
+# Ring buffer capacity: about 2.4 hours of samples at 120Hz.
+RING_BUFFER_CAPACITY = 1 << 20
+
 # Lomb–Scargle constants
 BLUEST_VISIBLE_WAVELENGTH = 390e-9
 FREQUENCY_TO_ANGULAR_FREQUENCY = 2.0 * np.pi
@@ -38,6 +43,109 @@ REDDEST_VISIBLE_WAVELENGTH = 700e-9
 THRESHOLD_QUANTILE = 0.90  # 90th percentile
 
 
+#########################
+### Class Definitions ###
+#########################
+
+
+class RingBuffer:
+    """A fixed-capacity store for the (time, value) samples of a device.
+
+    The samples are kept in two pre-allocated numpy arrays (one for the
+    times, one for the values) so that appending is O(1), memory use is
+    bounded, and readers get array views instead of re-boxing an
+    ever-growing list of Python tuples. Once the buffer fills up, the
+    oldest samples are overwritten.
+
+    Appending from the device thread while the GUI thread reads is safe:
+    each sample is fully written before the count is incremented, so
+    readers always see a consistent prefix.
+    """
+
+    def __init__(self, capacity: int = RING_BUFFER_CAPACITY) -> None:
+        self._time = np.empty(capacity, dtype=np.float64)
+        self._value = np.empty(capacity, dtype=np.float64)
+        self._capacity = capacity
+        self._count = 0
+        self._version = 0
+        self._epoch: float | None = None
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    def append(self, time: float, value: float) -> None:
+        """Appends a sample, overwriting the oldest one once full.
+
+        Times are stored relative to the first sample, so readers never
+        need to re-baseline the whole time column.
+        """
+        if self._epoch is None:
+            self._epoch = time
+
+        index = self._count % self._capacity
+        self._time[index] = time - self._epoch
+        self._value[index] = value
+        self._count += 1
+        self._version += 1
+
+    def clear(self) -> None:
+        """Discards all of the stored samples."""
+        self._count = 0
+        self._version += 1
+        self._epoch = None
+
+    @property
+    def version(self) -> int:
+        """A counter that changes whenever the contents change.
+
+        Unlike the sample count, this keeps increasing across clear(),
+        so two equal versions always mean identical contents.
+        """
+        return self._version
+
+    @property
+    def last(self) -> float:
+        """The most recent value; raises IndexError when empty."""
+        if not self._count:
+            raise IndexError("no samples stored")
+        return float(self._value[(self._count - 1) % self._capacity])
+
+    def _ordered(self, array: FloatArray) -> FloatArray:
+        """Returns the array's samples oldest-first (a view unless the
+        buffer has wrapped around)."""
+        if self._count <= self._capacity:
+            return array[: self._count]
+        index = self._count % self._capacity
+        return np.concatenate((array[index:], array[:index]))
+
+    @property
+    def times(self) -> FloatArray:
+        """The sample times, oldest first."""
+        return self._ordered(self._time)
+
+    @property
+    def values(self) -> FloatArray:
+        """The sample values, oldest first."""
+        return self._ordered(self._value)
+
+    @property
+    def columns(self) -> FloatColumns:
+        """The samples as a 2-column (time, value) array (a copy)."""
+        times, values = self.series
+        return np.column_stack((times, values))
+
+    @property
+    def series(self) -> FloatSeries:
+        """The samples as parallel (times, values) arrays.
+
+        Unlike columns, this doesn't copy anything unless the buffer has
+        wrapped around, so it's what the once-per-second plot path uses.
+        """
+        times, values = self.times, self.values
+        length = min(len(times), len(values))
+        return times[:length], values[:length]
+
+
 ############################
 ### Function Definitions ###
 ############################
@@ -53,23 +161,21 @@ def start_thread(func: Callable, *args) -> Thread:
 
 
 def parse_data(
-    motor_np: FloatColumns,
-    detector_np: FloatColumns,
+    motor_series: FloatSeries,
+    detector_series: FloatSeries,
 ) -> tuple[pl.DataFrame, pl.DataFrame]:
     """Parse the raw motor and detector data into DataFrames."""
 
+    # The ring buffers store times relative to their first sample, so
+    # no re-baselining is needed here.
+    motor_time, motor_position = motor_series
     motor = pl.DataFrame(
-        motor_np,
-        schema=(("time", pl.Float64), ("position", pl.Float64)),
-    ).with_columns(
-        pl.col("time") - pl.col("time").min(),
+        {"time": motor_time, "position": motor_position},
     )
 
+    detector_time, detector_intensity = detector_series
     detector = pl.DataFrame(
-        detector_np,
-        schema=(("time", pl.Float64), ("intensity", pl.Float64)),
-    ).with_columns(
-        pl.col("time") - pl.col("time").min(),
+        {"time": detector_time, "intensity": detector_intensity},
     )
 
     return motor, detector
@@ -113,8 +219,8 @@ def trim_endpoints(
 
 
 def interpolate_motion(
-    motor_np: pl.DataFrame,
-    detector_np: pl.DataFrame,
+    motor: pl.DataFrame,
+    detector: pl.DataFrame,
 ) -> FloatColumns:
     """Interpolate the motor positions.
 
@@ -123,15 +229,6 @@ def interpolate_motion(
     middle point in a run of identical position measurements, and linearly interpolate between them.
     """
 
-    motor = pl.DataFrame(
-        motor_np,
-        schema=(("time", pl.Float64), ("position", pl.Float64)),
-    )
-    detector = pl.DataFrame(
-        detector_np,
-        schema=(("time", pl.Float64), ("intensity", pl.Float64)),
-    )
-
     motor, detector = trim_endpoints(motor, detector)
 
     midpoint_positions = (
@@ -195,34 +292,40 @@ def remove_noise_floor(
     return np.clip(spectral_power - threshold, 0, None)
 
 
-def save_data(
-    path: Path,
-    motor_data: DeviceTimeValues,
-    detector_data: DeviceTimeValues,
-) -> None:
-    """Saves the motor and detector data to a CSV file."""
+def format_data(
+    motor_data: RingBuffer,
+    detector_data: RingBuffer,
+) -> bytes:
+    """Formats the motor and detector data as a TSV file's contents."""
+    # Snapshot through series so both columns are truncated to the same
+    # length: reading times and values separately can straddle an append
+    # from the device thread, and polars refuses mismatched heights.
+    motor_time, motor_position = motor_data.series
+    detector_time, detector_intensity = detector_data.series
+
     # Create the DataFrame
     motor = pl.DataFrame(
-        motor_data,
-        schema=(("motor_time", pl.Float64), ("motor_position", pl.Float64)),
-        orient="row",
+        {
+            "motor_time": motor_time,
+            "motor_position": motor_position,
+        }
     )
     detector = pl.DataFrame(
-        detector_data,
-        schema=(
-            ("detector_time", pl.Float64),
-            ("detector_intensity", pl.Float64),
-        ),
-        orient="row",
+        {
+            "detector_time": detector_time,
+            "detector_intensity": detector_intensity,
+        }
     )
     data = pl.concat([motor, detector], how="horizontal")
 
-    # Save the data
+    # Format the data
+    buffer = BytesIO()
     data.write_csv(
-        path,
+        buffer,
         include_header=True,
         line_terminator="\n",
         separator="\t",
         quote_style="never",
         null_value="null",
     )
+    return buffer.getvalue()